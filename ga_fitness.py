@@ -1,5 +1,28 @@
+import numpy as np
+from collections import OrderedDict
+from cat.plugins.NaturalComputingPlugIn.ga_fitness_numba import (
+    _fitness_kernel, _population_fitness_kernel)
+
+class FitnessComponents:
+    """Penalty breakdown of a feasible solution plus the arrays needed to
+    re-evaluate single-gene moves without a full fitness pass"""
+
+    def __init__(self, t_idx, s_idx, start, end, start_by_task, workloads,
+                 overlap_by_student, p_time, p_dep, p_skill, p_load):
+        self.t_idx = t_idx
+        self.s_idx = s_idx
+        self.start = start
+        self.end = end
+        self.start_by_task = start_by_task
+        self.workloads = workloads
+        self.overlap_by_student = overlap_by_student
+        self.p_time = p_time
+        self.p_dep = p_dep
+        self.p_skill = p_skill
+        self.p_load = p_load
+
 class FitnessCalculator:
-    def __init__(self, tasks, students):
+    def __init__(self, tasks, students, cache_size=2048):
         self.tasks = tasks
         self.students = students
         # Weight constants
@@ -9,82 +32,278 @@ class FitnessCalculator:
         self.w4 = 1.0  # workload balance weight
         self.w5 = 4.0  # overlap penalty weight
 
+        # Precompute Struct-of-Arrays views of the static problem data so
+        # each fitness call is vectorized instead of looping over dicts
+        self.task_index = {task_id: i for i, task_id in enumerate(tasks)}
+        self.student_index = {student_id: i for i, student_id in enumerate(students)}
+        self.n_tasks = len(tasks)
+        self.n_students = len(students)
+
+        self.durations = np.array([float(task['estimated_time']) for task in tasks.values()],
+                                  dtype=np.float64)
+        self.total_task_duration = float(self.durations.sum())
+
+        # Dependency edges as (child_index, parent_index) pairs
+        edges = [(self.task_index[task_id], self.task_index[dep])
+                 for task_id, task in tasks.items()
+                 for dep in task['dependencies']]
+        self.dep_edges = np.array(edges, dtype=np.int32).reshape(-1, 2)
+        # Contiguous per-column copies so the kernels gather without striding
+        self.dep_children = np.ascontiguousarray(self.dep_edges[:, 0])
+        self.dep_parents = np.ascontiguousarray(self.dep_edges[:, 1])
+        self.has_dep = bool(len(self.dep_edges))
+
+        # skill_deficit[t, s] = sum of (required_level - student_level) over
+        # the skills where student s falls short on task t
+        self.skill_deficit = np.zeros((self.n_tasks, self.n_students), dtype=np.float64)
+        for task_id, task in tasks.items():
+            t_idx = self.task_index[task_id]
+            for student_id, student in students.items():
+                deficit = sum(max(0.0, required_level - student['skills'].get(skill, 0))
+                              for skill, required_level in task['skill_requirements'].items())
+                self.skill_deficit[t_idx, self.student_index[student_id]] = deficit
+
+        # Scratch timelines reused by the compiled kernel for the overlap pass
+        self._timeline_start = np.empty((self.n_students, self.n_tasks), dtype=np.float64)
+        self._timeline_end = np.empty((self.n_students, self.n_tasks), dtype=np.float64)
+        self._timeline_count = np.zeros(self.n_students, dtype=np.int64)
+
+        # Bounded LRU cache so unchanged individuals (elites, migrants)
+        # never pay for a second kernel run
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
     def calculate_fitness(self, solution):
         """Calculate fitness based on the mathematical formulation F(s) = w₁P_time + w₂P_dep + w₃P_skill + w₄P_load + w₅P_overlap"""
         if not solution:
             return float('inf')
 
-        # Calculate completion times and total duration
-        completion_times = {}
-        start_times = {}
-        total_task_duration = sum(float(task['estimated_time']) for task in self.tasks.values())
-        student_workloads = {s: 0.0 for s in self.students}
-        student_timelines = {s: [] for s in self.students}  # For overlap detection
-
-        # First pass: calculate completion times and workloads
-        for task_id, student_id, start_time in solution:
-            task = self.tasks[task_id]
-            duration = float(task['estimated_time'])
-            start_time = float(start_time)
-            completion_time = start_time + duration
-            
-            completion_times[task_id] = completion_time
-            start_times[task_id] = start_time
-            student_workloads[student_id] += duration
-            student_timelines[student_id].append((start_time, completion_time))
-
-        # Check for missing tasks
-        if len(completion_times) != len(self.tasks):
-            return float('inf')
+        key = hash(tuple((task_id, student_id, float(start_time))
+                         for task_id, student_id, start_time in solution))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        fitness = self._calculate(solution)
+        self._cache[key] = fitness
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return fitness
+
+    def encode(self, solution):
+        """Struct-of-Arrays view of a solution: three parallel arrays of
+        task indices, student indices and float start times. This is the
+        single conversion point from the tuple chromosome to the array
+        layout every kernel works on."""
+        n = len(solution)
+        t_idx = np.fromiter((self.task_index[gene[0]] for gene in solution),
+                            dtype=np.int32, count=n)
+        s_idx = np.fromiter((self.student_index[gene[1]] for gene in solution),
+                            dtype=np.int32, count=n)
+        start = np.fromiter((float(gene[2]) for gene in solution),
+                            dtype=np.float64, count=n)
+        return t_idx, s_idx, start
+
+    def _calculate(self, solution):
+        n = len(solution)
+        t_idx, s_idx, start = self.encode(solution)
+
+        if n > self._timeline_start.shape[1]:
+            # Oversized solutions (duplicate tasks) need wider scratch timelines
+            self._timeline_start = np.empty((self.n_students, n), dtype=np.float64)
+            self._timeline_end = np.empty((self.n_students, n), dtype=np.float64)
+
+        return float(_fitness_kernel(
+            t_idx, s_idx, start, self.durations,
+            self.dep_children, self.dep_parents,
+            self.skill_deficit, self.n_tasks, self.n_students,
+            self.total_task_duration,
+            self.w1, self.w2, self.w3, self.w4, self.w5,
+            self._timeline_start, self._timeline_end, self._timeline_count))
+
+    def calculate_fitness_batch(self, population):
+        """Evaluate a whole population in one parallel kernel call.
+
+        Cached individuals are answered from the LRU; the rest are stacked
+        into (P, N) arrays and dispatched to the prange kernel, so one
+        Python->native transition covers the full population.
+        """
+        fitness = np.empty(len(population), dtype=np.float64)
+        keys = [None] * len(population)
+        pending = []
+        for i, solution in enumerate(population):
+            if not solution:
+                fitness[i] = np.inf
+                continue
+            key = hash(tuple((task_id, student_id, float(start_time))
+                             for task_id, student_id, start_time in solution))
+            keys[i] = key
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                fitness[i] = cached
+            else:
+                pending.append(i)
+
+        if pending:
+            lengths = {len(population[i]) for i in pending}
+            if len(lengths) == 1:
+                n = lengths.pop()
+                t_idx2d = np.empty((len(pending), n), dtype=np.int32)
+                s_idx2d = np.empty((len(pending), n), dtype=np.int32)
+                start2d = np.empty((len(pending), n), dtype=np.float64)
+                for row, i in enumerate(pending):
+                    for j, gene in enumerate(population[i]):
+                        t_idx2d[row, j] = self.task_index[gene[0]]
+                        s_idx2d[row, j] = self.student_index[gene[1]]
+                        start2d[row, j] = float(gene[2])
+                out = _population_fitness_kernel(
+                    t_idx2d, s_idx2d, start2d, self.durations,
+                    self.dep_children, self.dep_parents,
+                    self.skill_deficit, self.n_tasks, self.n_students,
+                    self.total_task_duration,
+                    self.w1, self.w2, self.w3, self.w4, self.w5)
+                for row, i in enumerate(pending):
+                    fitness[i] = out[row]
+            else:
+                # Mixed chromosome lengths cannot be stacked; fall back
+                for i in pending:
+                    fitness[i] = self._calculate(population[i])
+            for i in pending:
+                self._cache[keys[i]] = float(fitness[i])
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
 
-        # 1. Time Penalty (P_time)
-        total_completion_time = max(completion_times.values()) - min(start_times.values())
-        p_time = (total_completion_time / total_task_duration) * 100
-
-        # 2. Dependency Penalty (P_dep)
-        p_dep = 0
-        for task_id, task in self.tasks.items():
-            for dep_id in task['dependencies']:
-                if dep_id not in completion_times:
-                    return float('inf')
-                if start_times[task_id] < completion_times[dep_id]:
-                    violation = completion_times[dep_id] - start_times[task_id]
-                    p_dep += 300 * (violation / total_task_duration)
-
-        # 3. Skill Penalty (P_skill)
-        p_skill = 0
-        for task_id, student_id, _ in solution:
-            task = self.tasks[task_id]
-            student = self.students[student_id]
-            for skill, required_level in task['skill_requirements'].items():
-                student_level = student['skills'].get(skill, 0)
-                if student_level < required_level:
-                    p_skill += 200 * (required_level - student_level)
-
-        # 4. Workload Balance Penalty (P_load)
-        max_workload = max(student_workloads.values())
-        min_workload = min(student_workloads.values())
-        avg_workload = total_task_duration / len(self.students)
-        
-        if avg_workload == 0:
-            p_load = float('inf')
+        return fitness
+
+    def calculate_components(self, solution):
+        """Evaluate a solution keeping the per-penalty breakdown for delta
+        updates. Returns None for infeasible solutions (missing tasks)."""
+        if not solution or self.total_task_duration == 0:
+            return None
+
+        t_idx, s_idx, start = self.encode(solution)
+
+        if np.unique(t_idx).size != self.n_tasks:
+            return None
+
+        end = start + self.durations[t_idx]
+        start_by_task = np.empty(self.n_tasks, dtype=np.float64)
+        start_by_task[t_idx] = start
+
+        p_time = (end.max() - start.min()) / self.total_task_duration * 100.0
+        p_dep = self._dep_penalty(start_by_task)
+        p_skill = 200.0 * self.skill_deficit[t_idx, s_idx].sum()
+
+        workloads = np.bincount(s_idx, weights=self.durations[t_idx],
+                                minlength=self.n_students)
+        p_load = self._load_penalty(workloads)
+
+        comp = FitnessComponents(t_idx, s_idx, start, end, start_by_task,
+                                 workloads, np.zeros(self.n_students), p_time,
+                                 p_dep, p_skill, p_load)
+        for student in range(self.n_students):
+            comp.overlap_by_student[student] = self._student_overlap(comp, student)
+        return comp
+
+    def components_fitness(self, comp):
+        """Weighted sum of the penalties held by a FitnessComponents"""
+        p_overlap = 400.0 * comp.overlap_by_student.sum() / self.total_task_duration
+        return float(self.w1 * comp.p_time +
+                     self.w2 * comp.p_dep +
+                     self.w3 * comp.p_skill +
+                     self.w4 * comp.p_load +
+                     self.w5 * p_overlap)
+
+    def try_move(self, comp, moves, commit=False):
+        """Evaluate moves [(pos, new_student_index, new_start)] against comp,
+        recomputing only the affected penalty terms. Either field of a move
+        may be None to leave it unchanged. Reverts the arrays unless commit
+        is True (in which case comp is updated in place)."""
+        undo = []
+        affected_students = set()
+        start_changed = False
+
+        for pos, new_student, new_start in moves:
+            old_student = int(comp.s_idx[pos])
+            old_start = float(comp.start[pos])
+            undo.append((pos, old_student, old_start))
+            task = int(comp.t_idx[pos])
+            affected_students.add(old_student)
+            if new_student is not None and new_student != old_student:
+                duration = self.durations[task]
+                comp.s_idx[pos] = new_student
+                comp.workloads[old_student] -= duration
+                comp.workloads[new_student] += duration
+                affected_students.add(new_student)
+            if new_start is not None and new_start != old_start:
+                comp.start[pos] = new_start
+                comp.end[pos] = new_start + self.durations[task]
+                comp.start_by_task[task] = new_start
+                start_changed = True
+
+        # Recompute only the penalties the moves can have touched
+        p_skill = 200.0 * self.skill_deficit[comp.t_idx, comp.s_idx].sum() \
+            if any(m[1] is not None for m in moves) else comp.p_skill
+        p_load = self._load_penalty(comp.workloads)
+        p_time = comp.p_time
+        p_dep = comp.p_dep
+        if start_changed:
+            p_time = (comp.end.max() - comp.start.min()) / self.total_task_duration * 100.0
+            p_dep = self._dep_penalty(comp.start_by_task)
+
+        overlap_sum = comp.overlap_by_student.sum()
+        new_overlaps = {}
+        for student in affected_students:
+            new_overlaps[student] = self._student_overlap(comp, student)
+            overlap_sum += new_overlaps[student] - comp.overlap_by_student[student]
+        p_overlap = 400.0 * overlap_sum / self.total_task_duration
+
+        fitness = float(self.w1 * p_time + self.w2 * p_dep +
+                        self.w3 * p_skill + self.w4 * p_load +
+                        self.w5 * p_overlap)
+
+        if commit:
+            comp.p_time = p_time
+            comp.p_dep = p_dep
+            comp.p_skill = p_skill
+            comp.p_load = p_load
+            for student, overlap in new_overlaps.items():
+                comp.overlap_by_student[student] = overlap
         else:
-            p_load = 100 * (max_workload - min_workload) / avg_workload
-
-        # 5. Overlap Penalty (P_overlap)
-        p_overlap = 0
-        for student_id, timeline in student_timelines.items():
-            timeline.sort()  # Sort by start time
-            for i in range(len(timeline) - 1):
-                if timeline[i][1] > timeline[i + 1][0]:
-                    overlap_duration = timeline[i][1] - timeline[i + 1][0]
-                    p_overlap += 400 * (overlap_duration / total_task_duration)
-
-        # Calculate final fitness
-        fitness = (self.w1 * p_time + 
-                  self.w2 * p_dep + 
-                  self.w3 * p_skill + 
-                  self.w4 * p_load +
-                  self.w5 * p_overlap)
+            for pos, old_student, old_start in undo:
+                task = int(comp.t_idx[pos])
+                if comp.s_idx[pos] != old_student:
+                    duration = self.durations[task]
+                    comp.workloads[int(comp.s_idx[pos])] -= duration
+                    comp.workloads[old_student] += duration
+                    comp.s_idx[pos] = old_student
+                comp.start[pos] = old_start
+                comp.end[pos] = old_start + self.durations[task]
+                comp.start_by_task[task] = old_start
 
         return fitness
+
+    def _dep_penalty(self, start_by_task):
+        if not self.has_dep:
+            return 0.0
+        violation = np.maximum(0.0, start_by_task[self.dep_parents] +
+                               self.durations[self.dep_parents] -
+                               start_by_task[self.dep_children])
+        return float(300.0 * violation.sum() / self.total_task_duration)
+
+    def _load_penalty(self, workloads):
+        avg_workload = self.total_task_duration / self.n_students
+        return float(100.0 * (workloads.max() - workloads.min()) / avg_workload)
+
+    def _student_overlap(self, comp, student):
+        """Raw (unscaled) overlap duration within one student's timeline"""
+        mask = comp.s_idx == student
+        if np.count_nonzero(mask) < 2:
+            return 0.0
+        timeline_start = comp.start[mask]
+        timeline_end = comp.end[mask]
+        order = np.lexsort((timeline_end, timeline_start))
+        overlap = timeline_end[order][:-1] - timeline_start[order][1:]
+        return float(overlap[overlap > 0].sum())
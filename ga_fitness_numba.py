@@ -0,0 +1,195 @@
+import numpy as np
+from numba import njit, prange
+
+@njit(cache=True, fastmath=True)
+def _fitness_kernel(t_idx, s_idx, start, durations, dep_child, dep_parent,
+                    skill_deficit, n_tasks, n_students, total_dur,
+                    w1, w2, w3, w4, w5,
+                    timeline_start, timeline_end, timeline_count):
+    """Compute all five penalties of F(s) in fused native loops.
+
+    Operates purely on flat arrays so Numba can lower everything to
+    machine code with no Python object traffic. Mirrors the semantics of
+    the NumPy implementation exactly, including the infinite fitness for
+    schedules with missing tasks.
+    """
+    n = t_idx.shape[0]
+
+    # Missing-task check (also guarantees every dependency is scheduled)
+    seen = np.zeros(n_tasks, dtype=np.uint8)
+    for i in range(n):
+        seen[t_idx[i]] = 1
+    n_seen = 0
+    for t in range(n_tasks):
+        n_seen += seen[t]
+    if n_seen != n_tasks:
+        return np.inf
+
+    # Single pass: end times, workloads, makespan bounds, per-task starts
+    end = np.empty(n, dtype=np.float64)
+    workloads = np.zeros(n_students, dtype=np.float64)
+    start_by_task = np.empty(n_tasks, dtype=np.float64)
+    min_start = start[0]
+    max_end = start[0] + durations[t_idx[0]]
+    for i in range(n):
+        duration = durations[t_idx[i]]
+        end[i] = start[i] + duration
+        workloads[s_idx[i]] += duration
+        start_by_task[t_idx[i]] = start[i]
+        if start[i] < min_start:
+            min_start = start[i]
+        if end[i] > max_end:
+            max_end = end[i]
+
+    # 1. Time Penalty (P_time)
+    p_time = (max_end - min_start) / total_dur * 100.0
+
+    # 2. Dependency Penalty (P_dep)
+    p_dep = 0.0
+    for k in range(dep_child.shape[0]):
+        parent = dep_parent[k]
+        violation = (start_by_task[parent] + durations[parent]) - start_by_task[dep_child[k]]
+        if violation > 0.0:
+            p_dep += violation
+    p_dep = 300.0 * p_dep / total_dur
+
+    # 3. Skill Penalty (P_skill)
+    p_skill = 0.0
+    for i in range(n):
+        p_skill += skill_deficit[t_idx[i], s_idx[i]]
+    p_skill *= 200.0
+
+    # 4. Workload Balance Penalty (P_load)
+    max_workload = workloads[0]
+    min_workload = workloads[0]
+    for s in range(1, n_students):
+        if workloads[s] > max_workload:
+            max_workload = workloads[s]
+        if workloads[s] < min_workload:
+            min_workload = workloads[s]
+    avg_workload = total_dur / n_students
+    if avg_workload == 0.0:
+        return np.inf
+    p_load = 100.0 * (max_workload - min_workload) / avg_workload
+
+    # 5. Overlap Penalty (P_overlap)
+    # Bucket intervals per student, inserting each one directly at its
+    # sorted (start, end) position so no separate sort pass is needed
+    for s in range(n_students):
+        timeline_count[s] = 0
+    for i in range(n):
+        s = s_idx[i]
+        c = timeline_count[s]
+        b = c - 1
+        while b >= 0 and (timeline_start[s, b] > start[i] or
+                          (timeline_start[s, b] == start[i] and
+                           timeline_end[s, b] > end[i])):
+            timeline_start[s, b + 1] = timeline_start[s, b]
+            timeline_end[s, b + 1] = timeline_end[s, b]
+            b -= 1
+        timeline_start[s, b + 1] = start[i]
+        timeline_end[s, b + 1] = end[i]
+        timeline_count[s] = c + 1
+
+    p_overlap = 0.0
+    for s in range(n_students):
+        c = timeline_count[s]
+        # Sweep consecutive intervals for overlaps
+        for a in range(c - 1):
+            overlap = timeline_end[s, a] - timeline_start[s, a + 1]
+            if overlap > 0.0:
+                p_overlap += overlap
+    p_overlap = 400.0 * p_overlap / total_dur
+
+    return (w1 * p_time +
+            w2 * p_dep +
+            w3 * p_skill +
+            w4 * p_load +
+            w5 * p_overlap)
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _population_fitness_kernel(t_idx2d, s_idx2d, start2d, durations,
+                               dep_child, dep_parent, skill_deficit,
+                               n_tasks, n_students, total_dur,
+                               w1, w2, w3, w4, w5):
+    """Evaluate a whole population stacked as (P, N) SoA arrays.
+
+    Each row is an independent individual, so prange spreads rows across
+    cores; the per-row scratch timelines are thread-local by construction.
+    """
+    n_solutions = t_idx2d.shape[0]
+    n = t_idx2d.shape[1]
+    out = np.empty(n_solutions, dtype=np.float64)
+    for p in prange(n_solutions):
+        timeline_start = np.empty((n_students, n), dtype=np.float64)
+        timeline_end = np.empty((n_students, n), dtype=np.float64)
+        timeline_count = np.zeros(n_students, dtype=np.int64)
+        out[p] = _fitness_kernel(t_idx2d[p], s_idx2d[p], start2d[p],
+                                 durations, dep_child, dep_parent,
+                                 skill_deficit, n_tasks, n_students,
+                                 total_dur, w1, w2, w3, w4, w5,
+                                 timeline_start, timeline_end, timeline_count)
+    return out
+
+@njit(cache=True)
+def _validate_kernel(t_idx, s_idx, start, durations,
+                     dep_indptr, dep_indices, n_tasks, n_students):
+    """Feasibility check compiled over flat arrays.
+
+    Mirrors validate_schedule: push each start past its dependencies'
+    end times, slot it into the first gap in the student's timeline,
+    then reject any remaining overlap.
+    """
+    n = t_idx.shape[0]
+    task_start = np.empty(n_tasks, dtype=np.float64)
+    scheduled = np.zeros(n_tasks, dtype=np.uint8)
+    timeline_start = np.empty((n_students, n), dtype=np.float64)
+    timeline_end = np.empty((n_students, n), dtype=np.float64)
+    timeline_count = np.zeros(n_students, dtype=np.int64)
+
+    for i in range(n):
+        t = t_idx[i]
+        s = s_idx[i]
+        st = start[i]
+
+        # Dependencies must already be scheduled; start after they end
+        for k in range(dep_indptr[t], dep_indptr[t + 1]):
+            dep = dep_indices[k]
+            if scheduled[dep] == 0:
+                return False
+            dep_end = task_start[dep] + durations[dep]
+            if dep_end > st:
+                st = dep_end
+
+        # Find first available slot in the student's sorted timeline
+        duration = durations[t]
+        for j in range(timeline_count[s]):
+            if st < timeline_end[s, j]:
+                if st + duration <= timeline_start[s, j]:
+                    break
+                st = timeline_end[s, j]
+
+        task_start[t] = st
+        scheduled[t] = 1
+
+        # Sorted insertion keeps the timeline ordered by (start, end)
+        c = timeline_count[s]
+        b = c - 1
+        end = st + duration
+        while b >= 0 and (timeline_start[s, b] > st or
+                          (timeline_start[s, b] == st and
+                           timeline_end[s, b] > end)):
+            timeline_start[s, b + 1] = timeline_start[s, b]
+            timeline_end[s, b + 1] = timeline_end[s, b]
+            b -= 1
+        timeline_start[s, b + 1] = st
+        timeline_end[s, b + 1] = end
+        timeline_count[s] = c + 1
+
+    # Reject any overlap that survived slot-finding
+    for s in range(n_students):
+        for j in range(timeline_count[s] - 1):
+            if timeline_end[s, j] > timeline_start[s, j + 1]:
+                return False
+
+    return True
@@ -1,5 +1,6 @@
 import random
-from collections import defaultdict
+import numpy as np
+from collections import defaultdict, deque
 from enum import Enum
 
 class InitializationStrategy(Enum):
@@ -10,10 +11,37 @@ class InitializationStrategy(Enum):
     SKILL_BASED = "skill_based"
 
 class PopulationInitializer:
-    def __init__(self, tasks, students, strategy=InitializationStrategy.HYBRID):
+    def __init__(self, tasks, students, strategy=InitializationStrategy.HYBRID,
+                 random_state=None):
         self.tasks = tasks
         self.students = students
         self.strategy = strategy
+        # Instance-level RNG (shareable with the GA for reproducible runs)
+        self.random = random_state if random_state is not None else random.Random()
+        # The dependency DAG is static, so compute one canonical topological
+        # order up front instead of re-running a DFS per chromosome
+        self._topo_order = self._compute_topo_order()
+
+        # Plain float durations so construction never re-parses estimated_time
+        self.duration_by_task = {task_id: float(task['estimated_time'])
+                                 for task_id, task in tasks.items()}
+
+        # Dense skill-match matrix so per-(task, student) scoring is a
+        # single array load instead of a dict scan per call
+        self.task_idx = {task_id: i for i, task_id in enumerate(tasks)}
+        self.student_idx = {student_id: i for i, student_id in enumerate(students)}
+        self.student_ids = tuple(students.keys())
+        self.skill_match = np.zeros((len(tasks), len(students)), dtype=np.float32)
+        for task_id, task in tasks.items():
+            for student_id, student in students.items():
+                match_score = 0
+                for skill, required_level in task['skill_requirements'].items():
+                    student_level = student['skills'].get(skill, 0)
+                    if student_level >= required_level:
+                        match_score += 1
+                    else:
+                        match_score -= (required_level - student_level)
+                self.skill_match[self.task_idx[task_id], self.student_idx[student_id]] = match_score
 
     def create_population(self, population_size):
         """Create initial population based on selected strategy"""
@@ -52,7 +80,7 @@ class PopulationInitializer:
         """Create population with mix of random and intelligent solutions"""
         population = []
         while len(population) < population_size:
-            if random.random() < 0.3:  # 30% random
+            if self.random.random() < 0.3:  # 30% random
                 chromosome = self._create_random_chromosome()
             else:  # 70% intelligent
                 chromosome = self._create_intelligent_chromosome()
@@ -81,17 +109,16 @@ class PopulationInitializer:
     def _create_random_chromosome(self):
         """Create a completely random chromosome"""
         all_tasks = list(self.tasks.keys())
-        random.shuffle(all_tasks)
+        self.random.shuffle(all_tasks)
         
         chromosome = []
         current_time = 0
         
         for task_id in all_tasks:
-            student_id = random.choice(list(self.students.keys()))
-            start_time = str(current_time)
+            student_id = self.random.choice(self.student_ids)
+            start_time = float(current_time)
             chromosome.append((task_id, student_id, start_time))
-            task = self.tasks[task_id]
-            current_time = float(start_time) + float(task['estimated_time'])
+            current_time = start_time + self.duration_by_task[task_id]
         
         return chromosome
 
@@ -99,25 +126,23 @@ class PopulationInitializer:
         """Create chromosome considering all factors"""
         ordered_tasks = self._get_task_order()
         chromosome = []
+        start_by_task = {}
         student_end_times = {sid: 0.0 for sid in self.students}
-        
+
         for task_id in ordered_tasks:
             task = self.tasks[task_id]
-            duration = float(task['estimated_time'])
-            
+            duration = self.duration_by_task[task_id]
+
             # Find best student based on skills and availability
             best_student = None
             best_score = float('-inf')
             earliest_start = float('inf')
-            
-            # Check dependencies
-            dep_end_time = 0
-            for dep in task['dependencies']:
-                for dep_task_id, dep_student_id, dep_start in chromosome:
-                    if dep_task_id == dep:
-                        dep_end = float(dep_start) + float(self.tasks[dep]['estimated_time'])
-                        dep_end_time = max(dep_end_time, dep_end)
-            
+
+            # Check dependencies via the O(1) start-time map
+            dep_end_time = max((start_by_task[dep] + self.duration_by_task[dep]
+                                for dep in task['dependencies'] if dep in start_by_task),
+                               default=0.0)
+
             for student_id in self.students:
                 skill_score = self._calculate_skill_match(task_id, student_id)
                 workload_score = -student_end_times[student_id]
@@ -128,8 +153,9 @@ class PopulationInitializer:
                     best_student = student_id
                     earliest_start = max(dep_end_time, student_end_times[student_id])
             
-            start_time = str(earliest_start)
+            start_time = earliest_start
             chromosome.append((task_id, best_student, start_time))
+            start_by_task[task_id] = earliest_start
             student_end_times[best_student] = earliest_start + duration
         
         return chromosome
@@ -138,79 +164,66 @@ class PopulationInitializer:
         """Create chromosome prioritizing dependency satisfaction"""
         ordered_tasks = self._get_task_order()
         chromosome = []
+        start_by_task = {}
         current_time = 0
-        completed_tasks = set()
-        
+
         for task_id in ordered_tasks:
-            # Wait for dependencies
-            max_dep_time = 0
-            for dep in self.tasks[task_id]['dependencies']:
-                if dep not in completed_tasks:
-                    continue
-                for d_task, _, d_start in chromosome:
-                    if d_task == dep:
-                        dep_end = float(d_start) + float(self.tasks[dep]['estimated_time'])
-                        max_dep_time = max(max_dep_time, dep_end)
-            
+            # Wait for dependencies via the O(1) start-time map
+            max_dep_time = max((start_by_task[dep] + self.duration_by_task[dep]
+                                for dep in self.tasks[task_id]['dependencies']
+                                if dep in start_by_task),
+                               default=0.0)
+
             current_time = max(current_time, max_dep_time)
-            student_id = random.choice(list(self.students.keys()))
-            start_time = str(current_time)
-            
+            student_id = self.random.choice(self.student_ids)
+            start_time = float(current_time)
+
             chromosome.append((task_id, student_id, start_time))
-            completed_tasks.add(task_id)
-            current_time += float(self.tasks[task_id]['estimated_time'])
+            start_by_task[task_id] = current_time
+            current_time += self.duration_by_task[task_id]
         
         return chromosome
 
     def _create_skill_based_chromosome(self):
         """Create chromosome prioritizing skill matching"""
         all_tasks = list(self.tasks.keys())
-        random.shuffle(all_tasks)
+        self.random.shuffle(all_tasks)
         chromosome = []
         current_time = 0
         
         for task_id in all_tasks:
-            # Find best skilled student
-            best_student = max(self.students.keys(),
-                             key=lambda sid: self._calculate_skill_match(task_id, sid))
-            
-            start_time = str(current_time)
+            # Find best skilled student via one argmax over the match row
+            best_student = self.student_ids[int(self.skill_match[self.task_idx[task_id]].argmax())]
+
+            start_time = float(current_time)
             chromosome.append((task_id, best_student, start_time))
-            current_time += float(self.tasks[task_id]['estimated_time'])
+            current_time += self.duration_by_task[task_id]
         
         return chromosome
 
     def _calculate_skill_match(self, task_id, student_id):
         """Calculate skill match score between task and student"""
-        task = self.tasks[task_id]
-        student = self.students[student_id]
-        match_score = 0
-        
-        for skill, required_level in task['skill_requirements'].items():
-            student_level = student['skills'].get(skill, 0)
-            if student_level >= required_level:
-                match_score += 1
-            else:
-                match_score -= (required_level - student_level)
-        
-        return match_score
+        return self.skill_match[self.task_idx[task_id], self.student_idx[student_id]]
 
     def _get_task_order(self):
         """Get tasks in topological order respecting dependencies"""
+        return list(self._topo_order)
+
+    def _compute_topo_order(self):
+        """Build the topological order once with an iterative Kahn sort"""
         dependency_graph = self._get_dependency_graph()
-        visited = set()
+        in_degree = {task_id: len(task['dependencies'])
+                     for task_id, task in self.tasks.items()}
+
+        queue = deque(task_id for task_id, degree in in_degree.items() if degree == 0)
         order = []
-        
-        def visit(task_id):
-            if task_id in visited:
-                return
-            visited.add(task_id)
-            for dep in self.tasks[task_id]['dependencies']:
-                visit(dep)
+        while queue:
+            task_id = queue.popleft()
             order.append(task_id)
-            
-        for task_id in self.tasks:
-            visit(task_id)
+            for dependent in dependency_graph[task_id]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
         return order
 
     def _get_dependency_graph(self):
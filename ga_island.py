@@ -1,19 +1,32 @@
 import random
+import numpy as np
+import concurrent.futures
 from cat.plugins.NaturalComputingPlugIn.ga_main import GeneticAlgorithm
+from cat.plugins.NaturalComputingPlugIn.ga_fitness import FitnessCalculator
 from cat.plugins.NaturalComputingPlugIn.ga_initialization import InitializationStrategy
 
+def _evolve_island(island, generation):
+    """Evolve one island for a generation (module-level so it pickles)"""
+    island.evolve_generation(generation)
+    return island
+
 class IslandModel:
-    def __init__(self, tasks, students, num_islands=4, migration_interval=10, migration_size=2):
+    def __init__(self, tasks, students, num_islands=4, migration_interval=10, migration_size=2,
+                 generations=100, verbose=1):
         self.tasks = tasks
         self.students = students
         self.num_islands = num_islands
+        self.generations = generations
+        self.verbose = verbose  # 0 silent, 1 summaries, 2 per-generation detail
         self.migration_interval = migration_interval
         self.migration_size = migration_size
         self.best_solution = None
         self.best_solution_fitness = float('inf')
-        self.island_fitness_history = [[] for _ in range(num_islands)]  # Track fitness for each island
-        self.best_fitness_history = [[] for _ in range(num_islands)]  # Track best fitness history per island
         
+        # One calculator shared by every island so the precomputed matrices
+        # (durations, dependency edges, skill deficits) exist only once
+        self.fitness_calculator = FitnessCalculator(tasks, students)
+
         # Initialize islands with different configurations
         self.islands = []
         for i in range(num_islands):
@@ -27,99 +40,139 @@ class IslandModel:
                 crossover_rate=config['crossover_rate'],
                 init_strategy=config['init_strategy'],
                 crossover_strategy=config['crossover_strategy'],
-                use_simulated_annealing=config['use_sa']
+                use_simulated_annealing=config['use_sa'],
+                fitness_calculator=self.fitness_calculator
             )
             self.islands.append(ga)
 
+        # Preallocated contiguous fitness history (NaN marks unwritten
+        # slots), indexed [island, generation, individual]
+        max_pop = max(island.population_size for island in self.islands)
+        self.island_fitness_history = np.full(
+            (num_islands, generations, max_pop), np.nan, dtype=np.float32)
+        self.best_fitness_history = np.full(
+            (num_islands, generations), np.nan, dtype=np.float32)
+
+        # Islands are independent between migrations, so evolve them in
+        # parallel worker processes
+        self.pool = concurrent.futures.ProcessPoolExecutor(max_workers=num_islands)
+
     def run(self):
         """Run the island model"""
-        print(f"\nStarting Island Model GA with {self.num_islands} islands")
-        
+        if self.verbose >= 1:
+            print(f"\nStarting Island Model GA with {self.num_islands} islands")
+
         # Initialize all islands
         for i, island in enumerate(self.islands):
-            print(f"\nInitializing Island {i}")
+            if self.verbose >= 2:
+                print(f"\nInitializing Island {i}")
             island.initialize_population()
         
-        # Run for specified number of generations
-        for generation in range(100):
-            print(f"\n=== Generation {generation + 1} ===")
-            
-            # Evolve each island
-            for i, island in enumerate(self.islands):
-                print(f"\nIsland {i}:")
-                island.evolve_generation(generation)
-                
-                # Track fitness history for this island
-                current_fitness = [island.get_fitness(sol) for sol in island.current_population]
-                self.island_fitness_history[i].append(current_fitness)
-                self.best_fitness_history[i].append(min(current_fitness))  # Track best fitness this generation
+        # Run for specified number of generations; the worker pool is only
+        # needed for this loop, so shut it down afterwards rather than
+        # leaking idle processes into the plugin host
+        try:
+            for generation in range(self.generations):
+                if self.verbose >= 2:
+                    print(f"\n=== Generation {generation + 1} ===")
+
+                # Evolve all islands in parallel, then join before migration.
+                # The whole GA object is pickled to the worker, so drop the
+                # bounded caches first to keep the payload to the population
+                futures = []
+                for island in self.islands:
+                    island._fitness_cache.clear()
+                    island.fitness_calculator._cache.clear()
+                    futures.append(self.pool.submit(_evolve_island, island, generation))
+                for i, future in enumerate(futures):
+                    # The worker hands back an unpickled copy whose
+                    # calculator is a private clone; re-attach the shared
+                    # one (and the helpers that alias it) so the
+                    # precomputed matrices stay single-instance and the
+                    # calculator cache is reused across islands
+                    island = future.result()
+                    island.fitness_calculator = self.fitness_calculator
+                    island.local_search.fitness_calculator = self.fitness_calculator
+                    island.simulated_annealing.fitness_calculator = self.fitness_calculator
+                    self.islands[i] = island
+
+                for i, island in enumerate(self.islands):
+                    # Track fitness history for this island, reusing the values
+                    # evolve_generation already computed
+                    current_fitness = island.last_population_fitness
+                    self.island_fitness_history[i, generation, :len(current_fitness)] = current_fitness
+                    self.best_fitness_history[i, generation] = current_fitness.min()  # Best fitness this generation
                 
-                # Update best solution
-                if island.best_solution_fitness < self.best_solution_fitness:
-                    self.best_solution = [row[:] for row in island.best_solution]  # Deep copy
-                    self.best_solution_fitness = island.best_solution_fitness
-                    print(f"New global best fitness: {self.best_solution_fitness:.2f}")
+                    # Update best solution
+                    if island.best_solution_fitness < self.best_solution_fitness:
+                        self.best_solution = [row[:] for row in island.best_solution]  # Deep copy
+                        self.best_solution_fitness = island.best_solution_fitness
+                        if self.verbose >= 1:
+                            print(f"New global best fitness: {self.best_solution_fitness:.2f}")
                 
-                # Print island statistics
-                print(f"Island {i} Statistics:")
-                print(f"  Best Fitness: {min(current_fitness):.2f}")
-                print(f"  Average Fitness: {sum(current_fitness)/len(current_fitness):.2f}")
-                print(f"  Population Fitness: {current_fitness}")
+                    # Print island statistics outside the hot path only
+                    if self.verbose >= 2:
+                        print(f"\nIsland {i} Statistics:")
+                        print(f"  Best Fitness: {current_fitness.min():.2f}")
+                        print(f"  Average Fitness: {current_fitness.mean():.2f}")
+                        print(f"  Population Fitness: {current_fitness.tolist()}")
             
-            # Migrate solutions between islands
-            if generation % self.migration_interval == 0:
-                self._migrate_solutions()
-        
-        print("\n=== Island Model GA Complete ===")
-        print(f"Best fitness found: {self.best_solution_fitness:.2f}")
-        print("\nFinal Island Statistics:")
-        for i, history in enumerate(self.island_fitness_history):
-            final_fitness = history[-1]  # Get the last generation's fitness values
-            print(f"\nIsland {i}:")
-            print(f"  Best Fitness: {min(final_fitness):.2f}")
-            print(f"  Average Fitness: {sum(final_fitness)/len(final_fitness):.2f}")
-            print(f"  Population Fitness: {final_fitness}")
-            print(f"  Best Fitness History: {self.best_fitness_history[i]}")
-            
-        print("\nBest Fitness Progression Across All Generations:")
-        # e
+                # Migrate solutions between islands
+                if generation % self.migration_interval == 0:
+                    self._migrate_solutions()
         
+        finally:
+            self.pool.shutdown()
+
+        if self.verbose >= 1:
+            print("\n=== Island Model GA Complete ===")
+            print(f"Best fitness found: {self.best_solution_fitness:.2f}")
+            print("\nFinal Island Statistics:")
+            for i in range(self.num_islands):
+                final_fitness = self.island_fitness_history[i, -1]  # Last generation's fitness values
+                print(f"\nIsland {i}:")
+                print(f"  Best Fitness: {np.nanmin(final_fitness):.2f}")
+                print(f"  Average Fitness: {np.nanmean(final_fitness):.2f}")
+                if self.verbose >= 2:
+                    print(f"  Population Fitness: {final_fitness.tolist()}")
+                    print(f"  Best Fitness History: {self.best_fitness_history[i].tolist()}")
+
         return self.best_solution, self.best_solution_fitness
 
     def _migrate_solutions(self):
         """Migrate solutions between islands in a ring topology"""
-        print("\nPerforming migration...")
+        if self.verbose >= 2:
+            print("\nPerforming migration...")
         
         # For each island
         for i in range(self.num_islands):
             # Get source and destination islands
             source = i
             dest = (i + 1) % self.num_islands
-            
-            # Get best solutions from source island
+
             source_pop = self.islands[source].current_population
-            if not source_pop:
-                continue
-            
-            # Sort by fitness and select best solutions
-            migrants = sorted(source_pop, 
-                           key=lambda x: self.islands[source].get_fitness(x))[:self.migration_size]
-            
-            # Replace worst solutions in destination island
             dest_pop = self.islands[dest].current_population
-            if dest_pop:
-                # Sort by fitness (worst first)
-                sorted_dest = sorted(dest_pop,
-                                  key=lambda x: self.islands[dest].get_fitness(x),
-                                  reverse=True)
-                
-                # Replace worst solutions with migrants
-                for j, migrant in enumerate(migrants):
-                    if j < len(sorted_dest):
-                        idx = dest_pop.index(sorted_dest[j])
-                        dest_pop[idx] = [row[:] for row in migrant]  # Deep copy
-                
-                # print(f"Migrated {len(migrants)} solutions from Island {source} to Island {dest}")
+            if not source_pop or not dest_pop:
+                continue
+
+            k = min(self.migration_size, len(source_pop), len(dest_pop))
+
+            # One cached fitness pass per island, then argpartition picks the
+            # k best source / k worst destination indices in O(N)
+            src_fitness = np.fromiter(
+                (self.islands[source].get_fitness(s) for s in source_pop),
+                dtype=np.float64, count=len(source_pop))
+            dest_fitness = np.fromiter(
+                (self.islands[dest].get_fitness(s) for s in dest_pop),
+                dtype=np.float64, count=len(dest_pop))
+            best_idx = np.argpartition(src_fitness, k - 1)[:k]
+            worst_idx = np.argpartition(-dest_fitness, k - 1)[:k]
+
+            # Replace worst destination solutions with copies of the migrants
+            for b, w in zip(best_idx, worst_idx):
+                dest_pop[w] = list(source_pop[b])
+
+            # print(f"Migrated {k} solutions from Island {source} to Island {dest}")
     
     def _get_island_config(self, island_id):
         """Get configuration for each island to promote diversity"""
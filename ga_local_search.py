@@ -1,110 +1,114 @@
 import random
-from copy import deepcopy
 
 class LocalSearch:
-    def __init__(self, tasks, students, fitness_calculator):
+    def __init__(self, tasks, students, fitness_calculator, random_state=None):
         self.tasks = tasks
         self.students = students
         self.fitness_calculator = fitness_calculator
-        
+        # Instance-level RNG (shareable with the GA for reproducible runs)
+        self.random = random_state if random_state is not None else random.Random()
+        self._student_ids = tuple(students.keys())
+        self._duration_by_task = {task_id: float(task['estimated_time'])
+                                  for task_id, task in tasks.items()}
+
     def improve_solution(self, solution, max_iterations=100, max_no_improve=20):
-        """Apply local search to improve the solution."""
-        best_solution = deepcopy(solution)
-        best_fitness = self.fitness_calculator.calculate_fitness(best_solution)
-        current_solution = deepcopy(solution)
+        """Apply local search to improve the solution.
+
+        Moves are scored through FitnessCalculator.try_move, which only
+        recomputes the penalty terms a move can affect instead of running
+        the full fitness pass per neighbor.
+        """
+        fitness_calculator = self.fitness_calculator
+        comp = fitness_calculator.calculate_components(solution)
+        if comp is None:
+            # Infeasible schedules (missing tasks) stay infeasible under
+            # these moves, so there is nothing to improve
+            return solution[:], fitness_calculator.calculate_fitness(solution)
+
+        current_solution = solution[:]
+        best_fitness = fitness_calculator.components_fitness(comp)
         no_improve_counter = 0
-        
+
         for iteration in range(max_iterations):
-            # Try different neighborhood moves
+            # Try the three neighborhood moves: reassignment, time
+            # adjustment, task swap
             improved = False
-            
-            # 1. Try reassigning tasks to different students
-            new_solution = self._try_reassignment(current_solution)
-            new_fitness = self.fitness_calculator.calculate_fitness(new_solution)
-            if new_fitness < best_fitness:
-                best_solution = deepcopy(new_solution)
-                best_fitness = new_fitness
-                current_solution = deepcopy(new_solution)
-                improved = True
-            
-            # 2. Try adjusting task times
-            new_solution = self._try_time_adjustment(current_solution)
-            new_fitness = self.fitness_calculator.calculate_fitness(new_solution)
-            if new_fitness < best_fitness:
-                best_solution = deepcopy(new_solution)
-                best_fitness = new_fitness
-                current_solution = deepcopy(new_solution)
-                improved = True
-            
-            # 3. Try swapping tasks between students
-            new_solution = self._try_task_swap(current_solution)
-            new_fitness = self.fitness_calculator.calculate_fitness(new_solution)
-            if new_fitness < best_fitness:
-                best_solution = deepcopy(new_solution)
-                best_fitness = new_fitness
-                current_solution = deepcopy(new_solution)
-                improved = True
-            
+
+            for propose in (self._try_reassignment,
+                            self._try_time_adjustment,
+                            self._try_task_swap):
+                proposal = propose(current_solution)
+                if proposal is None:
+                    continue
+                moves, genes = proposal
+                new_fitness = fitness_calculator.try_move(comp, moves)
+                if new_fitness < best_fitness:
+                    fitness_calculator.try_move(comp, moves, commit=True)
+                    for pos, gene in genes:
+                        current_solution[pos] = gene
+                    best_fitness = new_fitness
+                    improved = True
+
             if not improved:
                 no_improve_counter += 1
             else:
                 no_improve_counter = 0
-                
+
             if no_improve_counter >= max_no_improve:
                 break
-                
-        return best_solution, best_fitness
-    
+
+        return current_solution, best_fitness
+
     def _try_reassignment(self, solution):
-        """Try reassigning a random task to a different student."""
-        new_solution = deepcopy(solution)
-        if not new_solution:
-            return new_solution
-            
+        """Propose reassigning a random task to a different student."""
+        if not solution:
+            return None
+
         # Select random task
-        task_idx = random.randint(0, len(new_solution) - 1)
-        task_id, _, start_time = new_solution[task_idx]
-        
+        task_idx = self.random.randint(0, len(solution) - 1)
+        task_id, _, start_time = solution[task_idx]
+
         # Try assigning to different student
-        new_student = random.choice(list(self.students.keys()))
-        new_solution[task_idx] = (task_id, new_student, start_time)
-        
-        return new_solution
-    
+        new_student = self.random.choice(self._student_ids)
+        moves = [(task_idx, self.fitness_calculator.student_index[new_student], None)]
+        genes = [(task_idx, (task_id, new_student, start_time))]
+        return moves, genes
+
     def _try_time_adjustment(self, solution):
-        """Try adjusting the start time of a random task."""
-        new_solution = deepcopy(solution)
-        if not new_solution:
-            return new_solution
-            
+        """Propose adjusting the start time of a random task."""
+        if not solution:
+            return None
+
         # Select random task
-        task_idx = random.randint(0, len(new_solution) - 1)
-        task_id, student_id, start_time = new_solution[task_idx]
-        
+        task_idx = self.random.randint(0, len(solution) - 1)
+        task_id, student_id, start_time = solution[task_idx]
+
         # Convert start_time to float
         start_time = float(start_time)
-        
+
         # Adjust start time slightly
-        max_adjustment = float(self.tasks[task_id]['estimated_time']) / 2
-        adjustment = random.uniform(-max_adjustment, max_adjustment)
+        max_adjustment = self._duration_by_task[task_id] / 2
+        adjustment = self.random.uniform(-max_adjustment, max_adjustment)
         new_start_time = max(0, start_time + adjustment)
-        
-        new_solution[task_idx] = (task_id, student_id, new_start_time)
-        return new_solution
-    
+
+        moves = [(task_idx, None, float(new_start_time))]
+        genes = [(task_idx, (task_id, student_id, new_start_time))]
+        return moves, genes
+
     def _try_task_swap(self, solution):
-        """Try swapping two tasks between different students."""
-        new_solution = deepcopy(solution)
-        if len(new_solution) < 2:
-            return new_solution
-            
+        """Propose swapping two tasks between different students."""
+        if len(solution) < 2:
+            return None
+
         # Select two random tasks
-        idx1, idx2 = random.sample(range(len(new_solution)), 2)
-        task1_id, student1_id, start1 = new_solution[idx1]
-        task2_id, student2_id, start2 = new_solution[idx2]
-        
+        idx1, idx2 = self.random.sample(range(len(solution)), 2)
+        task1_id, student1_id, start1 = solution[idx1]
+        task2_id, student2_id, start2 = solution[idx2]
+
         # Swap students
-        new_solution[idx1] = (task1_id, student2_id, start1)
-        new_solution[idx2] = (task2_id, student1_id, start2)
-        
-        return new_solution
\ No newline at end of file
+        student_index = self.fitness_calculator.student_index
+        moves = [(idx1, student_index[student2_id], None),
+                 (idx2, student_index[student1_id], None)]
+        genes = [(idx1, (task1_id, student2_id, start1)),
+                 (idx2, (task2_id, student1_id, start2))]
+        return moves, genes
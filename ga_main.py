@@ -1,8 +1,15 @@
 import random
 import os
 import json
+import time
+import functools
+from bisect import insort
+from collections import OrderedDict
+import numpy as np
+import xxhash
 from cat.plugins.NaturalComputingPlugIn.ga_initialization import PopulationInitializer, InitializationStrategy
 from cat.plugins.NaturalComputingPlugIn.ga_fitness import FitnessCalculator
+from cat.plugins.NaturalComputingPlugIn.ga_fitness_numba import _validate_kernel
 from cat.plugins.NaturalComputingPlugIn.ga_selection import Selection
 from cat.plugins.NaturalComputingPlugIn.ga_crossover import Crossover
 from cat.plugins.NaturalComputingPlugIn.ga_mutation import Mutation
@@ -18,7 +25,9 @@ class GeneticAlgorithm:
                 mutation_rate=0.1, crossover_rate=0.8,
                 init_strategy=InitializationStrategy.RANDOM,
                 crossover_strategy='single_point',
-                use_simulated_annealing=False):
+                use_simulated_annealing=False,
+                fitness_calculator=None,
+                seed=None):
         # Initialize parameters
         self.tasks = tasks
         self.students = students
@@ -35,33 +44,77 @@ class GeneticAlgorithm:
         self.best_solution = None
         self.best_solution_fitness = float('inf')
         
-        # Fitness cache
-        self._fitness_cache = {}
+        # Bounded LRU fitness cache, keyed on the bytes of a flat integer
+        # encoding of the solution (task index, student index, start time
+        # in 1/100ths); the bound keeps long island runs from growing the
+        # dict without limit
+        self._fitness_cache = OrderedDict()
+        self.cache_max = population_size * 20
+        self._key_buf = np.empty((len(tasks), 3), dtype=np.int64)
         
-        # Current population for island model
+        # Current population for island model, plus its fitness values so
+        # callers never need a second evaluation pass
         self.current_population = []
+        self.last_population_fitness = None
+        # Fitness of the population currently being evolved, for selection
+        self.fitness_array = None
         
-        # Initialize GA components
-        self.initializer = PopulationInitializer(tasks, students, init_strategy)
-        self.fitness_calculator = FitnessCalculator(tasks, students)
+        # Initialize GA components. Instance-level RNGs (seedable, and
+        # independent of the global Mersenne Twister state) so islands in
+        # worker processes never share or fight over module-level random
+        self.random = random.Random(seed)
+        self.rng = np.random.default_rng(seed)
+        self.initializer = PopulationInitializer(tasks, students, init_strategy,
+                                                 random_state=self.random)
+        # Reuse a caller-provided calculator (island model shares one across
+        # islands) so its precomputed matrices are built only once
+        self.fitness_calculator = fitness_calculator or FitnessCalculator(tasks, students)
         self.selection = Selection(self)
-        self.crossover = Crossover(tasks, self.initializer)
-        self.mutation = Mutation(tasks, students)
-        self.local_search = LocalSearch(tasks, students, self.fitness_calculator)
-        self.simulated_annealing = SimulatedAnnealing(tasks, students, self.fitness_calculator)
+        self.crossover = Crossover(tasks, self.initializer, rng=self.rng,
+                                   random_state=self.random)
+        self.mutation = Mutation(tasks, students, rng=self.rng, random_state=self.random)
+        self.local_search = LocalSearch(tasks, students, self.fitness_calculator,
+                                        random_state=self.random)
+        self.simulated_annealing = SimulatedAnnealing(tasks, students,
+                                                      self.fitness_calculator, seed=seed)
 
     def get_fitness(self, solution):
         """Get fitness with caching"""
-        solution_tuple = tuple(tuple(x) for x in solution)
-        
-        if solution_tuple not in self._fitness_cache:
-            self._fitness_cache[solution_tuple] = self.fitness_calculator.calculate_fitness(solution)
-        
-        return self._fitness_cache[solution_tuple]
+        key = self._solution_key(solution)
+
+        fitness = self._fitness_cache.get(key)
+        if fitness is None:
+            fitness = self.fitness_calculator.calculate_fitness(solution)
+            self._fitness_cache[key] = fitness
+            if len(self._fitness_cache) > self.cache_max:
+                self._fitness_cache.popitem(last=False)
+        else:
+            self._fitness_cache.move_to_end(key)
+
+        return fitness
+
+    def _solution_key(self, solution):
+        """Encode a solution into a compact integer cache key.
+
+        Avoids the nested tuple-of-tuples key (N+1 allocations per lookup)
+        by packing indices and centisecond start times into a reused int64
+        array and running xxhash over its buffer, so the key is a single
+        int rather than a byte string the dict must hash itself.
+        """
+        n = len(solution)
+        buf = self._key_buf if n == self._key_buf.shape[0] \
+            else np.empty((n, 3), dtype=np.int64)
+        task_index = self.fitness_calculator.task_index
+        student_index = self.fitness_calculator.student_index
+        for i, (task_id, student_id, start_time) in enumerate(solution):
+            buf[i, 0] = task_index[task_id]
+            buf[i, 1] = student_index[student_id]
+            buf[i, 2] = int(float(start_time) * 100)
+        return xxhash.xxh3_64_intdigest(buf)
 
     def clear_fitness_cache(self):
         """Clear the fitness cache"""
-        self._fitness_cache = {}
+        self._fitness_cache = OrderedDict()
 
     def initialize_population(self):
         """Initialize population for island model"""
@@ -73,64 +126,69 @@ class GeneticAlgorithm:
         if not self.current_population:
             self.initialize_population()
         
-        # Calculate fitness for all solutions
-        generation_fitness = []
-        for solution in self.current_population:
-            fitness = self.get_fitness(solution)
-            generation_fitness.append(fitness)
-            
-            if fitness < self.best_solution_fitness:
-                self.best_solution = solution
-                self.best_solution_fitness = fitness
-        
+        # Calculate fitness for all solutions in one batched kernel call
+        generation_fitness = self.fitness_calculator.calculate_fitness_batch(
+            self.current_population)
+        best_idx = int(np.argmin(generation_fitness))
+        if generation_fitness[best_idx] < self.best_solution_fitness:
+            self.best_solution = self.current_population[best_idx]
+            self.best_solution_fitness = float(generation_fitness[best_idx])
+
         # Track metrics
-        self.best_fitness_history.append(min(generation_fitness))
-        self.avg_fitness_history.append(sum(generation_fitness) / len(generation_fitness))
-        
-        # Evolve population
-        self.current_population = self.evolve_population(self.current_population, generation)
+        self.best_fitness_history.append(float(generation_fitness.min()))
+        self.avg_fitness_history.append(float(generation_fitness.mean()))
+
+        # Evolve population, reusing the fitness values computed while
+        # building the offspring
+        self.fitness_array = generation_fitness
+        self.current_population, self.last_population_fitness = self.evolve_population(
+            self.current_population, generation)
 
     def evolve_population(self, population, generation):
-        """Evolve the population through selection, crossover, and mutation"""
-        new_population = []
-        
-        # Keep track of best solution in this generation
-        generation_best = None
-        generation_best_fitness = float('inf')
-        
-        while len(new_population) < self.population_size:
+        """Evolve the population through selection, crossover, and mutation.
+
+        Returns (new_population, fitness array) so callers can reuse the
+        offspring fitness values already computed here instead of running
+        another evaluation pass.
+        """
+        # Offspring in creation order; the new population is its prefix and
+        # the whole batch is evaluated in one parallel kernel call below
+        offspring = []
+
+        while len(offspring) < self.population_size:
             # Select parents
-            parent1 = self.selection.tournament_select(population)
-            parent2 = self.selection.tournament_select(population)
+            parent1 = self.selection.tournament_select(population, self.fitness_array)
+            parent2 = self.selection.tournament_select(population, self.fitness_array)
             
             # Apply crossover
-            if random.random() < self.crossover_rate:
+            if self.random.random() < self.crossover_rate:
                 offspring1, offspring2 = self.crossover.crossover(parent1, parent2)
                 
                 # Apply local search to offspring with some probability
-                if random.random() < 0.4:  # 40% chance to apply local search
+                if self.random.random() < 0.4:  # 40% chance to apply local search
                     offspring1, _ = self.local_search.improve_solution(offspring1, max_iterations=20, max_no_improve=5)
                     offspring2, _ = self.local_search.improve_solution(offspring2, max_iterations=20, max_no_improve=5)
             else:
                 offspring1, offspring2 = parent1.copy(), parent2.copy()
             
-            # Apply mutation
-            if random.random() < self.mutation_rate:
-                offspring1 = self.mutation.mutate(offspring1)
-            if random.random() < self.mutation_rate:
-                offspring2 = self.mutation.mutate(offspring2)
-            
-            # Add to new population
-            new_population.append(offspring1)
-            if len(new_population) < self.population_size:
-                new_population.append(offspring2)
-            
-            # Update generation best
-            for offspring in [offspring1, offspring2]:
-                fitness = self.get_fitness(offspring)
-                if fitness < generation_best_fitness:
-                    generation_best = offspring
-                    generation_best_fitness = fitness
+            offspring.append(offspring1)
+            offspring.append(offspring2)
+
+        # Apply mutation: one vectorized coin flip for the whole batch,
+        # then mutate only the selected children
+        mutation_mask = self.rng.random(len(offspring)) < self.mutation_rate
+        for i in np.nonzero(mutation_mask)[0]:
+            offspring[i] = self.mutation.mutate(offspring[i])
+
+        # Evaluate every offspring (including a trailing extra that may not
+        # fit the population) across cores in a single batched call
+        offspring_all_fitness = self.fitness_calculator.calculate_fitness_batch(offspring)
+        best_idx = int(np.argmin(offspring_all_fitness))
+        generation_best = offspring[best_idx]
+        generation_best_fitness = float(offspring_all_fitness[best_idx])
+
+        new_population = offspring[:self.population_size]
+        offspring_fitness = offspring_all_fitness[:self.population_size]
 
         # Apply Simulated Annealing to generation's best solution
         if self.use_simulated_annealing and generation_best is not None:
@@ -144,36 +202,40 @@ class GeneticAlgorithm:
             
             if sa_fitness < generation_best_fitness:
                 # Replace worst solution in population with SA improved solution
-                worst_idx = max(range(len(new_population)), 
-                              key=lambda i: self.get_fitness(new_population[i]))
+                worst_idx = int(np.argmax(offspring_fitness))
                 new_population[worst_idx] = sa_solution
-        
-        return new_population
+                offspring_fitness[worst_idx] = sa_fitness
+
+        return new_population, offspring_fitness
 
     def run(self, cat):
         """Run the genetic algorithm"""
         
         population = self.initializer.create_population(self.population_size)
-        
-        
-        for generation in range(self.generations):            
-            # Calculate fitness for all solutions
-            cat.send_notification(f"Running iteration {generation+1}/{self.generations}")
-            generation_fitness = []
-            for solution in population:
-                fitness = self.get_fitness(solution)
-                generation_fitness.append(fitness)
-                
-                if fitness < self.best_solution_fitness:
-                    self.best_solution = solution
-                    self.best_solution_fitness = fitness
-            
+        # The initial population is the only one needing its own evaluation
+        # pass; afterwards evolve_population hands back offspring fitness
+        generation_fitness = self.fitness_calculator.calculate_fitness_batch(population)
+
+        # Notify every ~5% of progress instead of every generation: the
+        # notification is a network round trip and would otherwise
+        # serialize the loop behind it
+        notify_every = max(1, self.generations // 20)
+
+        for generation in range(self.generations):
+            if generation % notify_every == 0 or generation == self.generations - 1:
+                cat.send_notification(f"Running iteration {generation+1}/{self.generations}")
+            best_idx = int(np.argmin(generation_fitness))
+            if generation_fitness[best_idx] < self.best_solution_fitness:
+                self.best_solution = population[best_idx]
+                self.best_solution_fitness = float(generation_fitness[best_idx])
+
             # Track metrics
-            self.best_fitness_history.append(min(generation_fitness))
-            self.avg_fitness_history.append(sum(generation_fitness) / len(generation_fitness))
-            
+            self.best_fitness_history.append(float(generation_fitness.min()))
+            self.avg_fitness_history.append(float(generation_fitness.mean()))
+
             # Evolve population
-            population = self.evolve_population(population, generation)
+            self.fitness_array = generation_fitness
+            population, generation_fitness = self.evolve_population(population, generation)
         
         print("\n=== Genetic Algorithm Complete ===")
         print(f"Final best fitness: {self.best_solution_fitness}")
@@ -203,42 +265,34 @@ def load_data(filename):
 
 def validate_schedule(tasks, students, solution):
     """Validate if a schedule is feasible"""
-    # Create timeline for each student
-    student_timelines = {s: [] for s in students.keys()}
-    task_start_times = {}
-    
-    # First pass: calculate start times respecting dependencies
-    for task_id, student_id, start_time in solution:
-        task = tasks[task_id]
-        start_time = float(start_time)
-        
-        # Check dependencies
-        for dep in task['dependencies']:
-            if dep not in task_start_times:
-                return False
-            dep_end_time = task_start_times[dep] + float(tasks[dep]['estimated_time'])
-            start_time = max(start_time, dep_end_time)
-        
-        # Find first available slot for student
-        student_busy_times = student_timelines[student_id]
-        for busy_start, busy_end in student_busy_times:
-            if start_time < busy_end:
-                if start_time + float(task['estimated_time']) <= busy_start:
-                    break
-                start_time = busy_end
-        
-        # Update timelines
-        task_start_times[task_id] = start_time
-        student_timelines[student_id].append((start_time, start_time + float(task['estimated_time'])))
-        student_timelines[student_id].sort()
-    
-    # Check for overlaps
-    for student_id, timeline in student_timelines.items():
-        for i in range(len(timeline) - 1):
-            if timeline[i][1] > timeline[i + 1][0]:
-                return False
-    
-    return True
+    # Flatten the solution and static task data into arrays so the
+    # compiled kernel can run the feasibility check in native loops
+    task_index = {task_id: i for i, task_id in enumerate(tasks)}
+    student_index = {student_id: i for i, student_id in enumerate(students)}
+
+    n = len(solution)
+    t_idx = np.fromiter((task_index[gene[0]] for gene in solution),
+                        dtype=np.int32, count=n)
+    s_idx = np.fromiter((student_index[gene[1]] for gene in solution),
+                        dtype=np.int32, count=n)
+    start = np.fromiter((float(gene[2]) for gene in solution),
+                        dtype=np.float64, count=n)
+
+    durations = np.array([float(task['estimated_time']) for task in tasks.values()],
+                         dtype=np.float64)
+
+    # CSR-style dependency table: deps of task t live in
+    # dep_indices[dep_indptr[t]:dep_indptr[t + 1]]
+    dep_indptr = np.zeros(len(tasks) + 1, dtype=np.int64)
+    dep_indices = []
+    for task_id, task in tasks.items():
+        dep_indices.extend(task_index[dep] for dep in task['dependencies'])
+        dep_indptr[task_index[task_id] + 1] = len(dep_indices)
+    dep_indices = np.array(dep_indices, dtype=np.int32)
+
+    return bool(_validate_kernel(t_idx, s_idx, start, durations,
+                                 dep_indptr, dep_indices,
+                                 len(tasks), len(students)))
 
 def print_schedule(tasks, students, solution):
     """Print the optimized schedule with overlap checking"""
@@ -262,15 +316,17 @@ def print_schedule(tasks, students, solution):
         
         # Find first available slot for student
         student_busy_times = student_timelines[student_id]
-        for busy_start, busy_end in student_busy_times:
+        for busy_start, busy_end, _ in student_busy_times:
             if start_time < busy_end:
                 if start_time + float(task['estimated_time']) <= busy_start:
                     break
                 start_time = busy_end
         
         task_start_times[task_id] = start_time
-        student_timelines[student_id].append((start_time, start_time + float(task['estimated_time'])))
-        student_timelines[student_id].sort()
+        # Keep the task id with its interval so printing needs no lookup;
+        # insort keeps the timeline ordered without re-sorting each append
+        insort(student_timelines[student_id],
+               (start_time, start_time + float(task['estimated_time']), task_id))
         
         # Print task details
         student = students[student_id]
@@ -288,9 +344,7 @@ def print_schedule(tasks, students, solution):
     print("-" * 80)
     for student_id, timeline in student_timelines.items():
         print(f"\nStudent {student_id}:")
-        for start, end in timeline:
-            task_id = next(t_id for t_id, s_id, _ in solution 
-                         if s_id == student_id and abs(task_start_times[t_id] - start) < 0.01)
+        for start, end, task_id in timeline:
             print(f"  {start:.2f} - {end:.2f}: {tasks[task_id]['name']}")
             
         # Check for overlaps
@@ -298,17 +352,27 @@ def print_schedule(tasks, students, solution):
             if timeline[i][1] > timeline[i + 1][0]:
                 print(f"  WARNING: Overlap detected between tasks at time {timeline[i][1]:.2f}")
 
-@tool(return_direct=True, examples=["Run the genetic algorithm"])
-def main(input_by_llm, cat):
-    """Run the genetic algorithm to optimize the schedule, no input required"""
+@functools.lru_cache(maxsize=1)
+def _load_students(time_bucket):
+    """Load all student records from DynamoDB.
 
+    Follows LastEvaluatedKey so tables beyond the 1 MB scan limit are
+    read completely, and caches the result per five-minute bucket so
+    repeated GA runs skip the network round trips entirely.
+    """
     dynamodb = boto3.resource('dynamodb', region_name='eu-west-2')
     table = dynamodb.Table('studentInfo-euj5j6m525e2jbu6e466ge7iue-NONE')
+
+    items = []
     response = table.scan()
+    items.extend(response['Items'])
+    while 'LastEvaluatedKey' in response:
+        response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
+        items.extend(response['Items'])
 
     # Convert DynamoDB response to the format expected by the GA
     students = {}
-    for item in response['Items']:
+    for item in items:
         students[item['id']] = {
             'name': item['name'],
             'cognitive_power': float(item['cognitivePower']),
@@ -322,7 +386,14 @@ def main(input_by_llm, cat):
                 'analysis': float(item['analysis'])
             }
         }
-    
+    return students
+
+@tool(return_direct=True, examples=["Run the genetic algorithm"])
+def main(input_by_llm, cat):
+    """Run the genetic algorithm to optimize the schedule, no input required"""
+
+    students = _load_students(int(time.time() // 300))
+
     cat.send_chat_message(f"Loaded {students} students from DynamoDB")
 
     # Load data
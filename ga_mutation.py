@@ -2,23 +2,34 @@ import random
 import numpy as np
 
 class Mutation:
-    def __init__(self, tasks, students):
+    def __init__(self, tasks, students, rng=None, random_state=None):
         self.tasks = tasks
         self.students = students
+        # NumPy generator (shareable with the GA) for batched draws, plus
+        # an instance-level random.Random for the scalar draws
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.random = random_state if random_state is not None else random.Random()
         self.mutation_types = ['reassign', 'adjust_time', 'swap_tasks', 'shift_schedule']
         self.mutation_weights = [0.4, 0.3, 0.2, 0.1]  # Initial weights for mutation types
 
+        # Eligibility is static for a GA run, so resolve the suitable
+        # students per task once (falling back to everyone when no student
+        # covers all required skills)
+        self._student_ids = list(students.keys())
+        # Float durations resolved once, replacing the per-mutation dict
+        # walk plus float parse
+        self._duration_by_task = {task_id: float(task['estimated_time'])
+                                  for task_id, task in tasks.items()}
+        self._suitable = {
+            task_id: [student_id for student_id, student in students.items()
+                      if all(skill in student['skills']
+                             for skill in task['skill_requirements'])] or self._student_ids
+            for task_id, task in tasks.items()
+        }
+
     def get_suitable_student(self, task_id):
         """Find a suitable student based on task requirements"""
-        task = self.tasks[task_id]
-        required_skills = task['skill_requirements']
-        
-        suitable_students = []
-        for student_id, student in self.students.items():
-            if all(skill in student['skills'] for skill in required_skills):
-                suitable_students.append(student_id)
-        
-        return random.choice(suitable_students) if suitable_students else random.choice(list(self.students.keys()))
+        return self.random.choice(self._suitable[task_id])
 
     def mutate(self, solution, generation=0, max_generations=100, temperature_ratio=1.0):
         """Enhanced mutation with multiple strategies and temperature-based control"""
@@ -31,41 +42,46 @@ class Mutation:
         # High temperature = more mutations and more diverse changes
         # Low temperature = fewer mutations and more conservative changes
         num_mutations = max(1, int(len(solution) * 0.1 * temperature_ratio))
-        
-        for _ in range(num_mutations):
-            # Adjust weights based on both generation progress and temperature
-            progress = generation / max_generations
-            if temperature_ratio > 0.7:  # High temp: more experimental
-                self.mutation_weights = [0.4, 0.3, 0.2, 0.1]  # Favor reassignment
-            elif temperature_ratio > 0.3:  # Mid temp: balanced
-                self.mutation_weights = [0.5, 0.3, 0.1, 0.1]  # More conservative
-            else:  # Low temp: very conservative
-                self.mutation_weights = [0.6, 0.3, 0.1, 0.0]  # No schedule shifts at low temp
 
-            mutation_type = random.choices(self.mutation_types, weights=self.mutation_weights)[0]
-            
+        # Adjust weights based on temperature (fixed for the whole call,
+        # and kept local so mutate never touches instance state)
+        if temperature_ratio > 0.7:  # High temp: more experimental
+            weights = (0.4, 0.3, 0.2, 0.1)  # Favor reassignment
+        elif temperature_ratio > 0.3:  # Mid temp: balanced
+            weights = (0.5, 0.3, 0.1, 0.1)  # More conservative
+        else:  # Low temp: very conservative
+            weights = (0.6, 0.3, 0.1, 0.0)  # No schedule shifts at low temp
+
+        # Pre-draw all randomness for the call in three vectorized pulls
+        types = self.rng.choice(4, size=num_mutations, p=weights)
+        positions = self.rng.integers(0, len(mutated), size=num_mutations)
+        uniforms = self.rng.random(num_mutations)
+
+        for k in range(num_mutations):
+            mutation_type = self.mutation_types[types[k]]
+
             if mutation_type == 'reassign':
                 # Intelligent task reassignment
-                pos = random.randint(0, len(mutated) - 1)
+                pos = positions[k]
                 task_id, _, start_time = mutated[pos]
                 new_student = self.get_suitable_student(task_id)
                 mutated[pos] = (task_id, new_student, start_time)
                 
             elif mutation_type == 'adjust_time':
                 # Smart time adjustment based on task duration and temperature
-                pos = random.randint(0, len(mutated) - 1)
+                pos = positions[k]
                 task_id, student_id, start_time = mutated[pos]
-                task_duration = float(self.tasks[task_id]['estimated_time'])
+                task_duration = self._duration_by_task[task_id]
                 # More conservative time adjustments
                 max_adjustment = task_duration * temperature_ratio * 0.5
-                adjustment = random.uniform(-max_adjustment, max_adjustment)
-                new_start = str(max(0, float(start_time) + adjustment))
+                adjustment = (2.0 * uniforms[k] - 1.0) * max_adjustment
+                new_start = max(0.0, float(start_time) + adjustment)
                 mutated[pos] = (task_id, student_id, new_start)
                 
             elif mutation_type == 'swap_tasks':
                 # Swap two tasks between students
                 if len(mutated) >= 2:
-                    pos1, pos2 = random.sample(range(len(mutated)), 2)
+                    pos1, pos2 = self.random.sample(range(len(mutated)), 2)
                     task1, student1, time1 = mutated[pos1]
                     task2, student2, time2 = mutated[pos2]
                     mutated[pos1] = (task1, student2, time1)
@@ -74,17 +90,17 @@ class Mutation:
             else:  # shift_schedule
                 # Shift a sequence of tasks, length based on temperature
                 if len(mutated) >= 2:
-                    start_pos = random.randint(0, len(mutated) - 2)
+                    start_pos = self.random.randint(0, len(mutated) - 2)
                     # Shorter sequences
                     max_length = max(1, int(2 * temperature_ratio))
-                    length = random.randint(1, min(max_length, len(mutated) - start_pos))
+                    length = self.random.randint(1, min(max_length, len(mutated) - start_pos))
                     # Smaller shifts
                     max_shift = 2 * temperature_ratio
-                    shift = random.uniform(-max_shift, max_shift)
+                    shift = (2.0 * uniforms[k] - 1.0) * max_shift
                     
                     for i in range(start_pos, start_pos + length):
                         task_id, student_id, start_time = mutated[i]
-                        new_start = str(max(0, float(start_time) + shift))
+                        new_start = max(0.0, float(start_time) + shift)
                         mutated[i] = (task_id, student_id, new_start)
         
         return mutated
@@ -1,115 +1,162 @@
 import random
 import math
+import numpy as np
+from collections import deque
+from numba import njit
 from cat.plugins.NaturalComputingPlugIn.ga_mutation import Mutation
 from cat.plugins.NaturalComputingPlugIn.ga_fitness import FitnessCalculator
 
+@njit(cache=True)
+def _sa_accept(old_cost, new_cost, temperature, initial_temp, rand_u):
+    """Metropolis-style acceptance test, compiled so the per-iteration
+    branch runs as native arithmetic.
+
+    Better solutions are always accepted; worse ones with probability
+    exp(-relative_delta / (temp_ratio * 0.1)) against the supplied
+    uniform draw. Comparing in log space —
+    -relative_delta / (temp_ratio * 0.1) > log(rand_u) — gives the
+    same decision without evaluating the exponential.
+    """
+    if new_cost < old_cost:  # Better solution, always accept
+        return True
+
+    # Calculate relative improvement (epsilon guards a zero-cost current
+    # solution, which cannot be worsened-and-accepted anyway)
+    relative_delta = (new_cost - old_cost) / max(old_cost, 1e-12)
+
+    # More selective about accepting worse solutions
+    temp_ratio = temperature / initial_temp
+    return -relative_delta / (temp_ratio * 0.1) > math.log(rand_u)
+
 class SimulatedAnnealing:
-    def __init__(self, tasks, students, fitness_calculator=None):
+    def __init__(self, tasks, students, fitness_calculator=None, seed=None):
         self.tasks = tasks
         self.students = students
         self.fitness_calculator = fitness_calculator if fitness_calculator else FitnessCalculator(tasks, students)
-        self.mutation = Mutation(tasks, students)
-        
+        # Instance-level RNG (seedable for reproducible runs), mirroring
+        # the GeneticAlgorithm convention; its bound methods skip the
+        # module-attribute lookup of the global random functions
+        self.random = random.Random(seed)
+        self.mutation = Mutation(tasks, students, random_state=self.random)
+
+        # Float durations resolved once so the time-adjustment operator
+        # never walks the task dict in its hot path
+        self._task_durations = {task_id: float(task['estimated_time'])
+                                for task_id, task in tasks.items()}
+
+        # Snapshot the eligibility lists Mutation already resolved as
+        # tuples, so reassignment is a direct random.choice with no
+        # method-call indirection
+        self._suitable_students = {task_id: tuple(student_ids)
+                                   for task_id, student_ids in self.mutation._suitable.items()}
+
+        # Move operators and their temperature-band weights, fixed for the
+        # lifetime of the object so the hot loop never rebuilds them
+        self._ops = ('reassign', 'time', 'swap')
+        self._weights_high = (0.4, 0.4, 0.2)  # High temperature: try all operations
+        self._weights_mid = (0.5, 0.4, 0.1)   # Medium: focus on reassignment and time
+        self._weights_low = (0.3, 0.6, 0.1)   # Low: mostly small time adjustments
+        self._dispatch = {'reassign': self._try_reassignment,
+                          'time': self._try_time_adjustment,
+                          'swap': self._try_task_swap}
+
+        # Tabu list of recently accepted solution hashes: the swap and
+        # reassignment operators like to undo each other, and skipping
+        # known states breaks those small cycles
+        self._tabu = deque(maxlen=512)
+        self._tabu_set = set()
+
+        # Diagnostics (temperature/neighbor traces) are only collected
+        # when this is switched on
+        self.debug = False
+
+    def _solution_hash(self, solution, overrides=None):
+        """Hash of a solution with start times rounded to hundredths.
+        overrides maps positions to normalized replacement genes so a
+        neighbor can be hashed without materializing it."""
+        if overrides:
+            return hash(tuple(
+                overrides[i] if i in overrides else
+                (task_id, student_id, round(start_time, 2))
+                for i, (task_id, student_id, start_time) in enumerate(solution)))
+        return hash(tuple((task_id, student_id, round(start_time, 2))
+                          for task_id, student_id, start_time in solution))
+
+    def _remember_tabu(self, solution_hash):
+        if solution_hash in self._tabu_set:
+            return
+        if len(self._tabu) == self._tabu.maxlen:
+            self._tabu_set.discard(self._tabu.popleft())
+        self._tabu.append(solution_hash)
+        self._tabu_set.add(solution_hash)
+
     def _try_reassignment(self, solution, temperature):
-        """Try reassigning a random task to a different student."""
-        new_solution = solution.copy()
-        if not new_solution:
-            return new_solution
-            
+        """Propose reassigning a random task to a different student."""
+        if not solution:
+            return None
+
         # Select random task
-        task_idx = random.randint(0, len(new_solution) - 1)
-        task_id, _, start_time = new_solution[task_idx]
-        
+        task_idx = self.random.randint(0, len(solution) - 1)
+        task_id, student_id, start_time = solution[task_idx]
+
         # Try assigning to different student
-        new_student = self.mutation.get_suitable_student(task_id)  # Use intelligent student selection
-        new_solution[task_idx] = (task_id, new_student, start_time)
-        
-        return new_solution
-    
+        new_student = self.random.choice(self._suitable_students[task_id])  # Use intelligent student selection
+        if new_student == student_id:
+            return None  # Same draw: a no-op not worth scoring
+
+        moves = [(task_idx, self.fitness_calculator.student_index[new_student], None)]
+        genes = [(task_idx, (task_id, new_student, start_time))]
+        return moves, genes
+
     def _try_time_adjustment(self, solution, temperature):
-        """Try adjusting the start time of a random task."""
-        new_solution = solution.copy()
-        if not new_solution:
-            return new_solution
-            
+        """Propose adjusting the start time of a random task."""
+        if not solution:
+            return None
+
         # Select random task
-        task_idx = random.randint(0, len(new_solution) - 1)
-        task_id, student_id, start_time = new_solution[task_idx]
-        
-        # Convert start_time to float
-        start_time = float(start_time)
-        
+        task_idx = self.random.randint(0, len(solution) - 1)
+        task_id, student_id, start_time = solution[task_idx]
+
         # Temperature-based adjustment
         temp_ratio = temperature / self.initial_temp
-        task_duration = float(self.tasks[task_id]['estimated_time'])
+        task_duration = self._task_durations[task_id]
         max_adjustment = task_duration * temp_ratio * 0.5  # More conservative adjustment
-        adjustment = random.uniform(-max_adjustment, max_adjustment)
-        new_start_time = max(0, start_time + adjustment)
-        
-        new_solution[task_idx] = (task_id, student_id, str(new_start_time))
-        return new_solution
-    
+        adjustment = self.random.uniform(-max_adjustment, max_adjustment)
+        new_start_time = max(0.0, start_time + adjustment)
+
+        moves = [(task_idx, None, new_start_time)]
+        genes = [(task_idx, (task_id, student_id, new_start_time))]
+        return moves, genes
+
     def _try_task_swap(self, solution, temperature):
-        """Try swapping two tasks between different students."""
-        new_solution = solution.copy()
-        if len(new_solution) < 2:
-            return new_solution
-            
-        # Select two random tasks
-        pos1, pos2 = random.sample(range(len(new_solution)), 2)
-        task1, student1, time1 = new_solution[pos1]
-        task2, student2, time2 = new_solution[pos2]
-        
+        """Propose swapping two tasks between different students."""
+        if len(solution) < 2:
+            return None
+
+        # Select two random distinct positions; drawing from [0, n-2] and
+        # bumping past pos1 is uniform over distinct pairs and cheaper
+        # than random.sample on a range
+        n = len(solution)
+        pos1 = self.random.randint(0, n - 1)
+        pos2 = self.random.randint(0, n - 2)
+        if pos2 >= pos1:
+            pos2 += 1
+        task1, student1, time1 = solution[pos1]
+        task2, student2, time2 = solution[pos2]
+        if student1 == student2:
+            return None  # Swapping within one student changes nothing
+
         # Swap students
-        new_solution[pos1] = (task1, student2, time1)
-        new_solution[pos2] = (task2, student1, time2)
-        
-        return new_solution
-    
-    def _get_neighbor(self, solution, temperature):
-        """Generate a neighbor solution using focused local changes."""
-        temp_ratio = temperature / self.initial_temp
-        
-        # Choose operation based on temperature
-        if temp_ratio > 0.7:
-            # High temperature: try all operations
-            ops = ['reassign', 'time', 'swap']
-            weights = [0.4, 0.4, 0.2]
-        elif temp_ratio > 0.3:
-            # Medium temperature: focus on reassignment and time
-            ops = ['reassign', 'time', 'swap']
-            weights = [0.5, 0.4, 0.1]
-        else:
-            # Low temperature: mostly small time adjustments
-            ops = ['reassign', 'time', 'swap']
-            weights = [0.3, 0.6, 0.1]
-            
-        operation = random.choices(ops, weights=weights)[0]
-        
-        if operation == 'reassign':
-            return self._try_reassignment(solution, temperature)
-        elif operation == 'time':
-            return self._try_time_adjustment(solution, temperature)
-        else:
-            return self._try_task_swap(solution, temperature)
-    
-    def _acceptance_probability(self, old_cost, new_cost, temperature):
-        """Calculate probability of accepting worse solution."""
-        if new_cost < old_cost:  # Better solution, always accept
-            return 1.0
-        
-        # Calculate relative improvement
-        delta = new_cost - old_cost
-        relative_delta = delta / old_cost
-        
-        # More selective about accepting worse solutions
-        temp_ratio = temperature / self.initial_temp
-        
-        # Exponential decay with scaled delta
-        return math.exp(-relative_delta / (temp_ratio * 0.1))  # More selective acceptance
+        student_index = self.fitness_calculator.student_index
+        moves = [(pos1, student_index[student2], None),
+                 (pos2, student_index[student1], None)]
+        genes = [(pos1, (task1, student2, time1)),
+                 (pos2, (task2, student1, time2))]
+        return moves, genes
 
     def improve_solution(self, initial_solution, max_iterations=100, 
-                        initial_temp=1000.0, cooling_rate=0.95, min_temp=0.1):
+                        initial_temp=1000.0, cooling_rate=0.95, min_temp=0.1,
+                        allowed_slowdown_factor=5.0):
         """
         Improve a solution using simulated annealing
         
@@ -119,62 +166,146 @@ class SimulatedAnnealing:
             initial_temp: Starting temperature
             cooling_rate: Rate at which temperature decreases
             min_temp: Minimum temperature before stopping
+            allowed_slowdown_factor: Neighbors worse than this multiple of
+                the best fitness end the iteration's sampling early
             
         Returns:
             tuple: (best_solution, best_fitness)
         """
         self.initial_temp = initial_temp  # Store for normalized calculations
-        
-        current_solution = initial_solution.copy()
-        current_fitness = self.fitness_calculator.calculate_fitness(current_solution)
-        
-        best_solution = current_solution.copy()
+
+        # Genes are canonically (task_id, student_id, float): normalize the
+        # incoming solution once so the move operators never re-parse start
+        # times inside the loop
+        current_solution = [(task_id, student_id, float(start_time))
+                            for task_id, student_id, start_time in initial_solution]
+
+        fitness_calculator = self.fitness_calculator
+        # Bind the RNG methods used every iteration to locals once
+        rng_random = self.random.random
+        rng_choices = self.random.choices
+        comp = fitness_calculator.calculate_components(current_solution)
+        if comp is None:
+            # Infeasible schedules (missing tasks) stay infeasible under
+            # these moves, so there is nothing to anneal
+            return current_solution, fitness_calculator.calculate_fitness(current_solution)
+
+        current_fitness = fitness_calculator.components_fitness(comp)
+
+        # Snapshot bests as tuples: current_solution is patched in place on
+        # acceptance, so the snapshot must be detached, and a tuple makes
+        # it immutable by construction
+        best_solution = tuple(current_solution)
         best_fitness = current_fitness
-        
+        moves_committed = 0
+
+        # The cooling schedule is geometric and fixed up front, so compute
+        # it once and index into it instead of multiplying every iteration
+        temp_schedule = initial_temp * np.power(cooling_rate, np.arange(max_iterations))
         temperature = initial_temp
-        temperature_history = [temperature]
         no_improve = 0
-        accepted_worse = 0
-        total_tries = 0
-        neighbor_history = []
+
+        # Diagnostics are dead weight in production runs (nothing reads
+        # them), so only collect when debugging; the trace lists grow by
+        # O(max_iterations * num_neighbors) otherwise
+        debug = self.debug
+        if debug:
+            temperature_history = [temperature]
+            accepted_worse = 0
+            total_tries = 0
+            neighbor_history = []
+
+        # Adaptive sampling effort: when an exponential moving average of
+        # the per-iteration best neighbor stops improving, halve the
+        # number of neighbors drawn (down to one)
+        num_neighbors = 3  # Try multiple neighbors each iteration
+        neighbor_ema = None
+        stalled_iterations = 0
         
         # print("\nStarting Simulated Annealing...")
         # print(f"Initial fitness: {current_fitness:.2f}")
         # print(f"Initial temperature: {temperature:.2f}")
         
         for iteration in range(max_iterations):
+            temperature = float(temp_schedule[iteration])
             # Stop if temperature is too low
             if temperature < min_temp:
                 # print(f"Stopping: Temperature {temperature:.2f} below minimum {min_temp}")
                 break
             
-            # Generate multiple neighbors and pick the best one
-            num_neighbors = 3  # Try multiple neighbors each iteration
-            best_neighbor = None
+            # Generate multiple neighbor moves and pick the best one; each
+            # is scored through the delta path, which only recomputes the
+            # penalty terms the move touches
+            best_moves = None
+            best_genes = None
             best_neighbor_fitness = float('inf')
-            
-            for _ in range(num_neighbors):
-                neighbor = self._get_neighbor(current_solution, temperature)
-                neighbor_fitness = self.fitness_calculator.calculate_fitness(neighbor)
-                neighbor_history.append(neighbor_fitness)
 
-                
+            # Pick the weight band once per iteration and draw all the
+            # operation choices for it in a single call
+            temp_ratio = temperature / self.initial_temp
+            if temp_ratio > 0.7:
+                weights = self._weights_high
+            elif temp_ratio > 0.3:
+                weights = self._weights_mid
+            else:
+                weights = self._weights_low
+            ops_batch = rng_choices(self._ops, weights=weights, k=num_neighbors)
+
+            for op in ops_batch:
+                # Regenerate up to three times if the operator returns a
+                # no-op or the proposal lands on a recently visited
+                # (tabu) state
+                proposal = None
+                for _ in range(3):
+                    candidate = self._dispatch[op](current_solution, temperature)
+                    if candidate is None:
+                        continue
+                    overrides = {pos: (gene[0], gene[1], round(gene[2], 2))
+                                 for pos, gene in candidate[1]}
+                    if self._solution_hash(current_solution, overrides) not in self._tabu_set:
+                        proposal = candidate
+                        break
+                if proposal is None:
+                    continue
+                moves, genes = proposal
+                neighbor_fitness = fitness_calculator.try_move(comp, moves)
+                if debug:
+                    neighbor_history.append(neighbor_fitness)
+
                 if neighbor_fitness < best_neighbor_fitness:
-                    best_neighbor = neighbor
+                    best_moves = moves
+                    best_genes = genes
                     best_neighbor_fitness = neighbor_fitness
+                elif neighbor_fitness > allowed_slowdown_factor * best_fitness:
+                    # This neighborhood is clearly degenerate; stop
+                    # sampling it and let the temperature drop
+                    break
             
-            total_tries += 1
-            
+            if debug:
+                total_tries += 1
+
             # Use the best neighbor for acceptance decision
-            if self._acceptance_probability(current_fitness, best_neighbor_fitness, temperature) > random.random():
-                if best_neighbor_fitness > current_fitness:
+            if best_moves is not None and \
+               _sa_accept(current_fitness, best_neighbor_fitness, temperature,
+                          self.initial_temp, rng_random()):
+                if debug and best_neighbor_fitness > current_fitness:
                     accepted_worse += 1
-                current_solution = best_neighbor
+                fitness_calculator.try_move(comp, best_moves, commit=True)
+                for pos, gene in best_genes:
+                    current_solution[pos] = gene
                 current_fitness = best_neighbor_fitness
-                
+                self._remember_tabu(self._solution_hash(current_solution))
+                moves_committed += 1
+
+                # Periodically rebuild the components from scratch so
+                # accumulated floating-point drift cannot compound
+                if moves_committed % 64 == 0:
+                    comp = fitness_calculator.calculate_components(current_solution)
+                    current_fitness = fitness_calculator.components_fitness(comp)
+
                 # Update best if we found a better solution
                 if current_fitness < best_fitness:
-                    best_solution = current_solution.copy()
+                    best_solution = tuple(current_solution)
                     best_fitness = current_fitness
                     no_improve = 0
                     # print(f"New best fitness: {best_fitness:.2f}")
@@ -183,20 +314,35 @@ class SimulatedAnnealing:
             else:
                 no_improve += 1
             
-            # Cool down temperature
-            temperature *= cooling_rate
-            temperature_history.append(temperature)
-            
+            # Track the sampling effort: halve num_neighbors after 10
+            # consecutive iterations without meaningful EMA improvement
+            if best_neighbor_fitness != float('inf'):
+                if neighbor_ema is not None and neighbor_ema - best_neighbor_fitness < 1e-6:
+                    stalled_iterations += 1
+                    if stalled_iterations >= 10:
+                        num_neighbors = max(1, num_neighbors // 2)
+                        stalled_iterations = 0
+                else:
+                    stalled_iterations = 0
+                neighbor_ema = best_neighbor_fitness if neighbor_ema is None \
+                    else 0.9 * neighbor_ema + 0.1 * best_neighbor_fitness
+
+            if debug:
+                temperature_history.append(temperature)
+
             # Early stopping if no improvement for a while
             if no_improve >= 50:  # Reduced from 100 to be more aggressive about stopping
                 # print("Early stopping: No improvement for 50 iterations")
                 break
         
-        # print(f"\nSimulated Annealing complete after {iteration + 1} iterations")
-        # print(f"Final temperature: {temperature:.2f}")
-        # print(f"Temperature history: {temperature_history}")
-        # print(f"Best fitness found: {best_fitness:.2f}")
-        # print(f"Neighbor fitness history: {neighbor_history}")
-        # print(f"Accepted {accepted_worse} worse solutions out of {total_tries} attempts ({(accepted_worse/total_tries)*100:.1f}%)")
-        
-        return best_solution, best_fitness
+        if debug:
+            self.last_stats = {
+                'iterations': iteration + 1,
+                'final_temperature': temperature,
+                'temperature_history': temperature_history,
+                'neighbor_history': neighbor_history,
+                'accepted_worse': accepted_worse,
+                'total_tries': total_tries,
+            }
+
+        return list(best_solution), best_fitness